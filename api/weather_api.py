@@ -1,8 +1,171 @@
+import os  # For resolving the on-disk cache location
+import diskcache  # For a persistent response cache shared between processes
 import requests  # For making HTTP requests to fetch data from the API
+from requests.adapters import HTTPAdapter  # For connection pooling on the shared session
+import numpy as np  # For building forecast columns as typed arrays
 import pandas as pd  # For handling and analyzing tabular data
 from datetime import datetime  # For working with date and time
+from dateutil.tz import tzlocal  # For converting forecast timestamps to local time
+from concurrent.futures import ThreadPoolExecutor  # For issuing independent requests concurrently
+from collections import OrderedDict  # For the in-memory LRU response cache
+from dataclasses import dataclass  # For the typed current-weather record
+from functools import lru_cache, wraps  # For memoizing small string helpers and writing decorators
+import sys  # For interning repeated icon codes
+import threading  # For attaching the Streamlit context to worker threads
+import time  # For measuring cache entry age
 import streamlit as st  # For building interactive web apps
-from typing import Dict, Optional  # For type hinting to improve code readability
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx  # Streamlit thread context helpers
+from streamlit.runtime.scriptrunner.script_run_context import SCRIPT_RUN_CONTEXT_ATTR_NAME  # Thread attribute holding the context
+from typing import Callable, Dict, Optional, Tuple  # For type hinting to improve code readability
+
+try:
+    import orjson as json  # Faster JSON parsing straight from the response bytes
+except ImportError:
+    import json  # Fall back to the standard library parser
+
+__all__ = ["CurrentWeather", "REQUEST_TIMEOUT", "WeatherAPI", "get_weather_api"]
+
+# (connect, read) timeouts in seconds for every API request
+REQUEST_TIMEOUT = (3.05, 10)
+
+# Cache lifetimes in seconds, matched to how often OpenWeatherMap refreshes each endpoint
+CURRENT_WEATHER_TTL = 600  # Current weather updates roughly every 10 minutes
+FORECAST_TTL = 10800  # The forecast is issued in 3-hour steps
+
+# Decimal places coordinates are rounded to (~1 km), so nearby lookups share cache entries
+COORDINATE_PRECISION = 2
+
+# Directory of the on-disk response cache, which survives restarts and is shared by all workers
+DISK_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "weather_api")
+
+# How long an expired response is kept on disk as a fallback while the API is unreachable
+STALE_RESPONSE_TTL = 86400  # 24 hours
+
+def _with_script_ctx(func: Callable) -> Callable:
+    """
+    Wrap a function so it runs with the current Streamlit script context when called from a worker thread.
+
+    Args:
+        func (Callable): Function to run in a worker thread.
+
+    Returns:
+        Callable: Wrapped function that attaches the captured context for the duration of the call.
+    """
+    ctx = get_script_run_ctx()  # Context of the calling script run, so st.error still renders
+
+    def wrapper(*args, **kwargs):
+        thread = threading.current_thread()
+        previous = getattr(thread, SCRIPT_RUN_CONTEXT_ATTR_NAME, None)
+        add_script_run_ctx(thread, ctx)
+        try:
+            return func(*args, **kwargs)
+        finally:
+            # Pool threads outlive the session; restore the previous context so they don't keep this
+            # one and its state alive (add_script_run_ctx(thread, None) would re-attach the current one)
+            if previous is None:
+                if hasattr(thread, SCRIPT_RUN_CONTEXT_ATTR_NAME):
+                    delattr(thread, SCRIPT_RUN_CONTEXT_ATTR_NAME)
+            else:
+                setattr(thread, SCRIPT_RUN_CONTEXT_ATTR_NAME, previous)
+
+    return wrapper
+
+@dataclass(frozen=True)
+class CurrentWeather:
+    """
+    Current weather conditions for a location.
+    """
+    __slots__ = (
+        "temperature", "feels_like", "humidity", "pressure", "wind_speed",
+        "description", "icon", "city", "timestamp", "stale"
+    )
+
+    temperature: float  # Current temperature
+    feels_like: float  # Feels-like temperature
+    humidity: int  # Humidity percentage
+    pressure: int  # Atmospheric pressure in hPa
+    wind_speed: float  # Wind speed in km/h
+    description: str  # Weather description
+    icon: str  # Weather icon code
+    city: str  # City name
+    timestamp: str  # Time the data was fetched from the API
+    stale: bool  # True when served from an expired cache entry because the API was unreachable
+
+    def __reduce__(self):
+        # Rebuild through __init__; default slots unpickling would assign to the frozen fields
+        return (CurrentWeather, tuple(getattr(self, name) for name in self.__slots__))
+
+def _is_stale(result) -> bool:
+    """
+    Check whether a fetched result is an expired cache entry served because the API was unreachable.
+
+    Args:
+        result: CurrentWeather record, forecast DataFrame or None.
+
+    Returns:
+        bool: True if the result is stale fallback data.
+    """
+    if isinstance(result, pd.DataFrame):
+        return result.attrs.get("stale", False)
+    return getattr(result, "stale", False)
+
+def _ttl_cache(ttl: int, maxsize: int = 64) -> Callable:
+    """
+    Cache a fetcher's results in memory per coordinates for ttl seconds, without pickling them.
+
+    The wrapped function's first argument (the WeatherAPI client) is left out of the cache key.
+    Failed fetches (None) and stale fallback data are not cached, so the next call retries;
+    DataFrames are returned as shallow copies.
+
+    Args:
+        ttl (int): Seconds a cached result stays fresh.
+        maxsize (int): Maximum number of cached results; the least recently used is evicted first.
+
+    Returns:
+        Callable: Decorator applying the cache.
+    """
+    def decorator(func: Callable) -> Callable:
+        entries = OrderedDict()  # Cache key -> (time fetched, result)
+        lock = threading.Lock()  # Fetchers are called from several worker threads
+
+        @wraps(func)
+        def wrapper(_api, *args):
+            with lock:
+                entry = entries.get(args)
+                if entry is not None and time.monotonic() - entry[0] < ttl:
+                    entries.move_to_end(args)  # Mark as recently used
+                    result = entry[1]
+                else:
+                    result = None
+
+            if result is None:
+                result = func(_api, *args)
+                if result is None or _is_stale(result):
+                    return result  # Don't cache failures or stale fallbacks, so the next call retries
+                with lock:
+                    entries[args] = (time.monotonic(), result)
+                    entries.move_to_end(args)
+                    while len(entries) > maxsize:
+                        entries.popitem(last=False)  # Evict the least recently used entry
+
+            # Hand out a shallow copy so callers can't swap columns in the cached frame
+            return result.copy(deep=False) if isinstance(result, pd.DataFrame) else result
+
+        return wrapper
+    return decorator
+
+@lru_cache(maxsize=256)
+def _capitalize(text: str) -> str:
+    """
+    Capitalize a weather description, reusing the result for the small set of descriptions the API returns.
+
+    Args:
+        text (str): Weather description from the API.
+
+    Returns:
+        str: Capitalized description.
+    """
+    return text.capitalize()
 
 class WeatherAPI:
     def __init__(_self, api_key: str):
@@ -14,28 +177,93 @@ class WeatherAPI:
         """
         _self.api_key = api_key  # Store the API key
         _self.base_url = "https://api.openweathermap.org/data/2.5"  # Base URL for the API endpoints
-        
-    def _make_request(_self, endpoint: str, params: Dict) -> Optional[Dict]:
+
+        # Reuse one pooled session so repeated calls keep their TCP/TLS connections alive;
+        # it is public so other OpenWeatherMap calls (e.g. geocoding) can share the pool
+        _self.session = requests.Session()
+        _self.session.mount("https://", HTTPAdapter(pool_connections=8, pool_maxsize=16))
+        _self.session.headers.update({
+            "Accept-Encoding": "gzip, deflate",  # Compressed payloads; the forecast JSON shrinks several-fold
+            "Accept": "application/json"
+        })
+        _self.session.params = {
+            "appid": api_key,  # Include API key in every request
+            "units": "metric"  # Use metric units (e.g., Celsius)
+        }
+
+        # Persistent cache of raw API responses; if the directory isn't usable, fetch from the network only
+        try:
+            _self._cache = diskcache.Cache(DISK_CACHE_DIR)
+        except Exception:
+            _self._cache = None
+
+        # Long-lived worker threads for concurrent fetches, so each page load doesn't spawn new ones
+        _self._executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix="weather-api")
+
+    def _cache_get(_self, key: Tuple):
+        """
+        Read an entry from the on-disk cache, treating any cache error as a miss.
+
+        Args:
+            key (Tuple): Cache key.
+
+        Returns:
+            The cached value, or None if it is missing or the cache is unavailable.
+        """
+        if _self._cache is None:
+            return None
+        try:
+            return _self._cache.get(key)
+        except Exception:
+            return None  # Locked, read-only or corrupt cache: fall back to the network
+
+    def _cache_set(_self, key: Tuple, value, expire: int) -> None:
+        """
+        Write an entry to the on-disk cache, ignoring any cache error.
+
+        Args:
+            key (Tuple): Cache key.
+            value: Value to store.
+            expire (int): Seconds until the entry is removed.
+        """
+        if _self._cache is None:
+            return
+        try:
+            _self._cache.set(key, value, expire=expire)
+        except Exception:
+            pass  # A failed write must not discard a good response
+
+    def _make_request(_self, endpoint: str, params: Dict, ttl: int) -> Tuple[Optional[Dict], float, bool]:
         """
         Make an API request to the specified endpoint with the given parameters.
         
         Args:
             endpoint (str): The specific API endpoint to hit (e.g., "weather").
             params (Dict): Query parameters for the API request.
+            ttl (int): Seconds an on-disk cached response is served without refetching.
 
         Returns:
-            Optional[Dict]: JSON response from the API or None in case of an error.
+            Tuple[Optional[Dict], float, bool]: JSON response (None if unavailable), the Unix time it was
+            fetched from the API, and whether it is an expired cache entry returned because the request failed.
         """
+        # Serve from the on-disk cache if another process or an earlier run already fetched it
+        cache_key = ("response", endpoint, tuple(sorted(params.items())))
+        cached = _self._cache_get(cache_key)  # (time fetched, data)
+        if cached is not None and time.time() - cached[0] < ttl:
+            return cached[1], cached[0], False
+
         try:
-            # Construct the full URL and add essential parameters
+            # Construct the full URL; the API key and units come from the session defaults
             url = f"{_self.base_url}/{endpoint}"
-            params["appid"] = _self.api_key  # Include API key in the parameters
-            params["units"] = "metric"  # Use metric units (e.g., Celsius)
 
-            # Make the API request
-            response = requests.get(url, params=params)
+            # Make the API request over the pooled session
+            response = _self.session.get(url, params=params, timeout=REQUEST_TIMEOUT)
             response.raise_for_status()  # Raise an exception for HTTP errors
-            return response.json()  # Return the JSON response
+            data = json.loads(response.content)  # Parse the JSON response from the raw bytes
+            fetched_at = time.time()
+            # Keep it for other processes and restarts, and as a fallback if later requests fail
+            _self._cache_set(cache_key, (fetched_at, data), STALE_RESPONSE_TTL)
+            return data, fetched_at, False
         except requests.exceptions.HTTPError as http_err:
             # Handle specific HTTP errors
             if response.status_code == 401:
@@ -47,10 +275,39 @@ class WeatherAPI:
         except Exception as err:
             # Handle any other errors
             st.error(f"Error occurred: {err}")
-        return None  # Return None in case of an error
+        if cached is not None:
+            return cached[1], cached[0], True  # Fall back to the last good response, flagged as stale
+        return None, 0.0, False  # Return None in case of an error
 
-    @st.cache_data(ttl=1800)
-    def get_weather_by_coordinates(_self, lat: float, lon: float) -> Optional[Dict]:
+    def get_weather_by_coordinates(_self, lat: float, lon: float) -> Optional[CurrentWeather]:
+        """
+        Get current weather data for specific coordinates, served from the cache when fresh.
+        Coordinates are rounded to about 1 km so nearby lookups reuse the same entry.
+
+        Args:
+            lat (float): Latitude of the location.
+            lon (float): Longitude of the location.
+
+        Returns:
+            Optional[CurrentWeather]: Parsed weather data or None if the request fails.
+        """
+        return _cached_weather(_self, round(lat, COORDINATE_PRECISION), round(lon, COORDINATE_PRECISION))
+
+    def get_forecast_by_coordinates(_self, lat: float, lon: float) -> Optional[pd.DataFrame]:
+        """
+        Get a 5-day weather forecast for specific coordinates, served from the cache when fresh.
+        Coordinates are rounded to about 1 km so nearby lookups reuse the same entry.
+
+        Args:
+            lat (float): Latitude of the location.
+            lon (float): Longitude of the location.
+
+        Returns:
+            Optional[pd.DataFrame]: DataFrame with forecast data or None if the request fails.
+        """
+        return _cached_forecast(_self, round(lat, COORDINATE_PRECISION), round(lon, COORDINATE_PRECISION))
+
+    def _fetch_weather(_self, lat: float, lon: float) -> Optional[CurrentWeather]:
         """
         Fetch current weather data for specific coordinates.
 
@@ -59,28 +316,28 @@ class WeatherAPI:
             lon (float): Longitude of the location.
 
         Returns:
-            Optional[Dict]: Parsed weather data or None if the request fails.
+            Optional[CurrentWeather]: Parsed weather data or None if the request fails.
         """
         params = {"lat": lat, "lon": lon}  # Define parameters for the API call
-        data = _self._make_request("weather", params)  # Make the API call
+        data, fetched_at, stale = _self._make_request("weather", params, CURRENT_WEATHER_TTL)  # Make the API call
         
         if data:
             # Parse and return the relevant weather information
-            return {
-                "temperature": round(data["main"]["temp"], 1),  # Current temperature
-                "feels_like": round(data["main"]["feels_like"], 1),  # Feels-like temperature
-                "humidity": data["main"]["humidity"],  # Humidity percentage
-                "pressure": data["main"]["pressure"],  # Atmospheric pressure in hPa
-                "wind_speed": round(data["wind"]["speed"] * 3.6, 1),  # Wind speed in km/h
-                "description": data["weather"][0]["description"].capitalize(),  # Weather description
-                "icon": data["weather"][0]["icon"],  # Weather icon code
-                "city": data.get("name", "Unknown Location"),  # City name (fallback: Unknown)
-                "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S")  # Current timestamp
-            }
+            return CurrentWeather(
+                temperature=round(data["main"]["temp"], 1),  # Current temperature
+                feels_like=round(data["main"]["feels_like"], 1),  # Feels-like temperature
+                humidity=data["main"]["humidity"],  # Humidity percentage
+                pressure=data["main"]["pressure"],  # Atmospheric pressure in hPa
+                wind_speed=round(data["wind"]["speed"] * 3.6, 1),  # Wind speed in km/h
+                description=_capitalize(data["weather"][0]["description"]),  # Weather description
+                icon=sys.intern(data["weather"][0]["icon"]),  # Weather icon code
+                city=data.get("name", "Unknown Location"),  # City name (fallback: Unknown)
+                timestamp=datetime.fromtimestamp(fetched_at).strftime("%Y-%m-%d %H:%M:%S"),  # When it was fetched
+                stale=stale  # Whether this is fallback data from an expired cache entry
+            )
         return None  # Return None if no data is available
 
-    @st.cache_data(ttl=1800)
-    def get_forecast_by_coordinates(_self, lat: float, lon: float) -> Optional[pd.DataFrame]:
+    def _fetch_forecast(_self, lat: float, lon: float) -> Optional[pd.DataFrame]:
         """
         Fetch a 5-day weather forecast for specific coordinates.
 
@@ -89,37 +346,113 @@ class WeatherAPI:
             lon (float): Longitude of the location.
 
         Returns:
-            Optional[pd.DataFrame]: DataFrame with forecast data or None if the request fails.
+            Optional[pd.DataFrame]: DataFrame with forecast data or None if the request fails; its attrs
+            record when it was fetched ("fetched_at") and whether it is stale fallback data ("stale").
         """
         params = {"lat": lat, "lon": lon}  # Define parameters for the API call
-        data = _self._make_request("forecast", params)  # Make the API call
+        data, fetched_at, stale = _self._make_request("forecast", params, FORECAST_TTL)  # Make the API call
         
         if data:
             # Extract and organize the forecast data
-            forecast_data = []
-            for item in data["list"]:
-                forecast_data.append({
-                    "timestamp": datetime.fromtimestamp(item["dt"]),  # Forecast timestamp
-                    "temperature": round(item["main"]["temp"], 1),  # Forecast temperature
-                    "humidity": item["main"]["humidity"],  # Forecast humidity
-                    "wind_speed": round(item["wind"]["speed"] * 3.6, 1),  # Forecast wind speed in km/h
-                    "description": item["weather"][0]["description"].capitalize(),  # Forecast description
-                })
-            return pd.DataFrame(forecast_data)  # Convert to a DataFrame for analysis
+            items = data["list"]
+            n = len(items)
+
+            # Fill one typed array per column instead of building a dict per row
+            epochs = np.empty(n, dtype=np.int64)  # Forecast timestamps as Unix seconds
+            temperatures = np.empty(n, dtype=np.float64)  # Forecast temperatures
+            humidities = np.empty(n, dtype=np.int8)  # Forecast humidity (0-100 fits in one byte)
+            wind_speeds = np.empty(n, dtype=np.float64)  # Forecast wind speeds in m/s
+            descriptions = np.empty(n, dtype=object)  # Forecast descriptions
+            for i, item in enumerate(items):
+                epochs[i] = item["dt"]
+                temperatures[i] = item["main"]["temp"]
+                humidities[i] = item["main"]["humidity"]
+                wind_speeds[i] = item["wind"]["speed"]
+                descriptions[i] = _capitalize(item["weather"][0]["description"])
+
+            # Unit conversion and rounding run once over whole columns
+            timestamps = (
+                pd.to_datetime(epochs, unit="s", utc=True)
+                .tz_convert(tzlocal())  # Local time, as datetime.fromtimestamp gives
+                .tz_localize(None)
+                .to_numpy()
+            )
+            np.round(temperatures, 1, out=temperatures)
+            wind_speeds *= 3.6  # Convert to km/h
+            np.round(wind_speeds, 1, out=wind_speeds)
+
+            forecast = pd.DataFrame({
+                "timestamp": timestamps,
+                "temperature": temperatures,
+                "humidity": humidities,
+                "wind_speed": wind_speeds,
+                "description": pd.Categorical(descriptions),  # Few distinct values, stored as integer codes
+            }, copy=False)  # Build the DataFrame directly from the column arrays
+            # When it was fetched from the API, as a string so the attrs stay JSON-serializable for Arrow
+            forecast.attrs["fetched_at"] = datetime.fromtimestamp(fetched_at).strftime("%Y-%m-%d %H:%M:%S")
+            forecast.attrs["stale"] = stale  # Whether this is fallback data from an expired cache entry
+            return forecast
         return None  # Return None if no data is available
 
-    def calculate_weather_kpis(_self, current_data: Dict, forecast_data: pd.DataFrame) -> Dict:
+    def get_weather_and_forecast(_self, lat: float, lon: float) -> Tuple[Optional[CurrentWeather], Optional[pd.DataFrame]]:
+        """
+        Fetch current weather and the 5-day forecast concurrently for specific coordinates.
+
+        Args:
+            lat (float): Latitude of the location.
+            lon (float): Longitude of the location.
+
+        Returns:
+            Tuple[Optional[CurrentWeather], Optional[pd.DataFrame]]: Current weather data and forecast DataFrame.
+        """
+        # Both requests are I/O-bound, so issue them side by side instead of one after the other
+        current_future = _self._executor.submit(_with_script_ctx(_self.get_weather_by_coordinates), lat, lon)
+        forecast_future = _self._executor.submit(_with_script_ctx(_self.get_forecast_by_coordinates), lat, lon)
+        return current_future.result(), forecast_future.result()
+
+    def prefetch_locations(_self, locations: Dict[str, Dict], max_workers: int = 5) -> Dict[str, Tuple[Optional[CurrentWeather], Optional[pd.DataFrame]]]:
+        """
+        Fetch current weather and forecast for several locations in parallel, warming the cache.
+
+        Args:
+            locations (Dict[str, Dict]): Mapping of location name to {"lat": ..., "lon": ...}.
+            max_workers (int): Maximum number of requests in flight at once, to stay within the API rate limit.
+
+        Returns:
+            Dict[str, Tuple[Optional[CurrentWeather], Optional[pd.DataFrame]]]: Current weather and forecast per location name.
+        """
+        # The bounded pool caps concurrency; every request for every location is queued up front.
+        # Workers run without a script context, so a failing warm-up fetch doesn't put an error on the page.
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {
+                name: (
+                    executor.submit(_self.get_weather_by_coordinates, loc["lat"], loc["lon"]),
+                    executor.submit(_self.get_forecast_by_coordinates, loc["lat"], loc["lon"])
+                )
+                for name, loc in locations.items()
+            }
+            results = {}
+            for name, (current_future, forecast_future) in futures.items():
+                current, forecast = current_future.result(), forecast_future.result()
+                # Leave stale fallbacks out so callers fetch live instead of holding on to old data
+                results[name] = (
+                    None if _is_stale(current) else current,
+                    None if _is_stale(forecast) else forecast
+                )
+            return results
+
+    def calculate_weather_kpis(_self, current_data: CurrentWeather, forecast_data: pd.DataFrame) -> Dict:
         """
         Calculate Key Performance Indicators (KPIs) from weather data.
 
         Args:
-            current_data (Dict): Current weather data.
+            current_data (CurrentWeather): Current weather data.
             forecast_data (pd.DataFrame): DataFrame with forecast data.
 
         Returns:
             Dict: Calculated KPIs including temperature trends and weather stability.
         """
-        if not current_data or forecast_data is None:
+        if not current_data or forecast_data is None or forecast_data.empty:
             # Return default KPIs if data is missing
             return {
                 "current_temp": None,
@@ -129,44 +462,84 @@ class WeatherAPI:
                 "weather_stability": 0
             }
             
+        # Pull each column out once and derive every statistic from the same arrays
+        temperatures = forecast_data["temperature"].to_numpy()
+        humidities = forecast_data["humidity"].to_numpy()
+        temp_trend, weather_stability = _self._calculate_forecast_stats(temperatures, humidities)
+
         # Calculate and return the KPIs
         kpis = {
-            "current_temp": current_data["temperature"],  # Current temperature
-            "temp_trend": _self._calculate_temperature_trend(forecast_data),  # Temperature trend over 5 days
-            "avg_humidity": round(forecast_data["humidity"].mean(), 1),  # Average humidity
-            "max_wind_speed": round(forecast_data["wind_speed"].max(), 1),  # Maximum wind speed
-            "weather_stability": _self._calculate_weather_stability(forecast_data)  # Weather stability score
+            "current_temp": current_data.temperature,  # Current temperature
+            "temp_trend": temp_trend,  # Temperature trend over 5 days
+            "avg_humidity": round(float(humidities.mean()), 1),  # Average humidity
+            "max_wind_speed": round(float(forecast_data["wind_speed"].to_numpy().max()), 1),  # Maximum wind speed
+            "weather_stability": weather_stability  # Weather stability score
         }
         return kpis
 
-    def _calculate_temperature_trend(_self, forecast_data: pd.DataFrame) -> float:
+    def _calculate_forecast_stats(_self, temperatures: np.ndarray, humidities: np.ndarray) -> Tuple[float, float]:
         """
-        Calculate the temperature trend over the forecast period.
+        Calculate the temperature trend and weather stability score from the forecast columns.
 
         Args:
-            forecast_data (pd.DataFrame): DataFrame with forecast data.
+            temperatures (np.ndarray): Forecast temperatures.
+            humidities (np.ndarray): Forecast humidity values.
 
         Returns:
-            float: Difference in average temperature between the first and last day.
+            Tuple[float, float]: Difference in average temperature between the first and last day,
+            and the weather stability score (0-100) based on temperature and humidity variance.
         """
-        if len(forecast_data) < 2:
-            return 0  # Return 0 if not enough data points
-        first_day = forecast_data.head(8)["temperature"].mean()  # Average temp for the first day
-        last_day = forecast_data.tail(8)["temperature"].mean()  # Average temp for the last day
-        return round(last_day - first_day, 1)  # Return the trend
+        # Temperature trend: average of the last day minus average of the first day
+        if temperatures.size < 2:
+            temp_trend = 0.0  # Not enough data points
+        else:
+            temp_trend = round(float(temperatures[-8:].mean() - temperatures[:8].mean()), 1)
 
-    def _calculate_weather_stability(_self, forecast_data: pd.DataFrame) -> float:
-        """
-        Calculate a weather stability score based on temperature and humidity variance.
+        # Stability: average of 100 / (1 + variance / scale) for temperature and humidity
+        temp_variance = temperatures.var(ddof=1)  # Temperature (sample) variance
+        humidity_variance = humidities.var(ddof=1)  # Humidity (sample) variance
+        stability = 50.0 * (1.0 / (1.0 + temp_variance * 0.1) + 1.0 / (1.0 + humidity_variance * 0.01))
+        return temp_trend, round(float(stability), 1)
 
-        Args:
-            forecast_data (pd.DataFrame): DataFrame with forecast data.
+@_ttl_cache(ttl=CURRENT_WEATHER_TTL)
+def _cached_weather(_api: WeatherAPI, lat: float, lon: float) -> Optional[CurrentWeather]:
+    """
+    Cache current weather per coordinates; the WeatherAPI instance is left out of the cache key.
 
-        Returns:
-            float: Weather stability score (0-100).
-        """
-        temp_variance = forecast_data["temperature"].var()  # Temperature variance
-        humidity_variance = forecast_data["humidity"].var()  # Humidity variance
-        temp_stability = 100 * (1 / (1 + temp_variance / 10))  # Stability score for temperature
-        humidity_stability = 100 * (1 / (1 + humidity_variance / 100))  # Stability score for humidity
-        return round((temp_stability + humidity_stability) / 2, 1)  # Average stability score
+    Args:
+        _api (WeatherAPI): Client used to fetch the data on a cache miss.
+        lat (float): Latitude of the location.
+        lon (float): Longitude of the location.
+
+    Returns:
+        Optional[CurrentWeather]: Parsed weather data or None if the request fails.
+    """
+    return _api._fetch_weather(lat, lon)
+
+@_ttl_cache(ttl=FORECAST_TTL)
+def _cached_forecast(_api: WeatherAPI, lat: float, lon: float) -> Optional[pd.DataFrame]:
+    """
+    Cache the 5-day forecast per coordinates; the WeatherAPI instance is left out of the cache key.
+
+    Args:
+        _api (WeatherAPI): Client used to fetch the data on a cache miss.
+        lat (float): Latitude of the location.
+        lon (float): Longitude of the location.
+
+    Returns:
+        Optional[pd.DataFrame]: DataFrame with forecast data or None if the request fails.
+    """
+    return _api._fetch_forecast(lat, lon)
+
+@st.cache_resource
+def get_weather_api(api_key: str) -> WeatherAPI:
+    """
+    Get the WeatherAPI client shared by all sessions on this server.
+
+    Args:
+        api_key (str): Your OpenWeatherMap API key.
+
+    Returns:
+        WeatherAPI: Shared client, so its connection pool and caches persist across reruns.
+    """
+    return WeatherAPI(api_key)
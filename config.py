@@ -1,4 +1,5 @@
 import os
+import numpy as np
 from dotenv import load_dotenv
 
 # Load environment variables
@@ -22,6 +23,19 @@ DEFAULT_LOCATIONS = {
     
 }
 
+# Default locations as parallel arrays, for vectorized lookups over all cities (not used by the app itself)
+DEFAULT_LOCATION_NAMES = np.array(list(DEFAULT_LOCATIONS), dtype=object)
+DEFAULT_LOCATION_LATS = np.fromiter(
+    (loc["lat"] for loc in DEFAULT_LOCATIONS.values()),
+    dtype=np.float32,
+    count=len(DEFAULT_LOCATIONS)
+)
+DEFAULT_LOCATION_LONS = np.fromiter(
+    (loc["lon"] for loc in DEFAULT_LOCATIONS.values()),
+    dtype=np.float32,
+    count=len(DEFAULT_LOCATIONS)
+)
+
 
 
 # Cache settings
@@ -1,11 +1,47 @@
 import streamlit as st  # For building the interactive web app
 import folium  # For creating interactive maps
 from streamlit_folium import folium_static, st_folium  # To integrate folium maps into Streamlit
-from api.weather_api import WeatherAPI  # Custom module to fetch weather data
-from config import *  # Configuration file with constants like API key and defaults
-import plotly.express as px  # For creating interactive charts
-from datetime import datetime  # For handling date and time
-import requests  # For making HTTP requests (used for geocoding)
+from api.weather_api import REQUEST_TIMEOUT, get_weather_api  # Custom module to fetch weather data
+from config import (  # Configuration file with constants like API key and defaults
+    DEFAULT_LOCATIONS,
+    DEFAULT_MAP_CENTER,
+    DEFAULT_MAP_ZOOM,
+    OPENWEATHER_API_KEY
+)
+import plotly.graph_objects as go  # For creating interactive charts
+import time  # For timing repeated fetches of the same location
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def fetch_geocoding(location_name, api_key):
+    """
+    Look up a location name with the OpenWeatherMap Geocoding API, caching results per query.
+
+    Args:
+        location_name (str): Name of the location to search for.
+        api_key (str): OpenWeatherMap API key for authentication.
+
+    Returns:
+        list: A list of tuples with location details (name, latitude, longitude, state/country).
+    """
+    # API endpoint for geocoding
+    url = "https://api.openweathermap.org/geo/1.0/direct"
+    params = {
+        "q": location_name,  # Query location
+        "limit": 5,  # Maximum number of results
+        "appid": api_key  # API key for authentication
+    }
+    # Make the request over the weather client's pooled session and parse the response
+    response = get_weather_api(api_key).session.get(url, params=params, timeout=REQUEST_TIMEOUT)
+    response.raise_for_status()  # Raise an error for invalid responses
+    locations = response.json()
+    
+    # Return a list of locations with relevant details
+    if locations:
+        return [
+            (loc['name'], loc['lat'], loc['lon'], f"{loc.get('state', '')}, {loc.get('country', '')}") 
+            for loc in locations
+        ]
+    return []
 
 def geocode_location(location_name, api_key):
     """
@@ -19,25 +55,8 @@ def geocode_location(location_name, api_key):
         list: A list of tuples with location details (name, latitude, longitude, state/country).
     """
     try:
-        # API endpoint for geocoding
-        url = "http://api.openweathermap.org/geo/1.0/direct"
-        params = {
-            "q": location_name,  # Query location
-            "limit": 5,  # Maximum number of results
-            "appid": api_key  # API key for authentication
-        }
-        # Make the request and parse the response
-        response = requests.get(url, params=params)
-        response.raise_for_status()  # Raise an error for invalid responses
-        locations = response.json()
-        
-        # Return a list of locations with relevant details
-        if locations:
-            return [
-                (loc['name'], loc['lat'], loc['lon'], f"{loc.get('state', '')}, {loc.get('country', '')}") 
-                for loc in locations
-            ]
-        return []
+        # Errors propagate out of the cached lookup, so failed requests are retried rather than cached
+        return fetch_geocoding(location_name, api_key)
     except Exception as e:
         # Handle errors and notify the user
         st.error(f"Error in geocoding: {str(e)}")
@@ -50,9 +69,27 @@ st.set_page_config(
     layout="wide"  # Use a wide layout for the dashboard
 )
 
-# Initialize the WeatherAPI class if not already in session state
-if 'weather_api' not in st.session_state:
-    st.session_state.weather_api = WeatherAPI(OPENWEATHER_API_KEY)
+# Fragment-scoped reruns arrived in Streamlit 1.33 (st.experimental_fragment, later st.fragment);
+# on older versions fragments fall back to plain functions that rerun with the whole script
+_fragment = getattr(st, "fragment", None) or getattr(st, "experimental_fragment", None)
+FRAGMENTS_SUPPORTED = _fragment is not None
+fragment = _fragment or (lambda func: func)
+
+# st.rerun replaced st.experimental_rerun in Streamlit 1.27
+rerun = getattr(st, "rerun", None) or st.experimental_rerun
+
+@st.cache_resource(ttl=600)
+def prefetch_default_locations(_api):
+    """
+    Fetch weather data for all default locations in parallel, shared by all sessions for 10 minutes.
+
+    Args:
+        _api (WeatherAPI): Shared weather client (not hashed).
+
+    Returns:
+        dict: Current weather and forecast per default location name.
+    """
+    return _api.prefetch_locations(DEFAULT_LOCATIONS)
 
 def initialize_session_state():
     """
@@ -64,70 +101,200 @@ def initialize_session_state():
         st.session_state.location_name = "Select a location"
     if 'map_center' not in st.session_state:
         st.session_state.map_center = DEFAULT_MAP_CENTER  # Default map center coordinates
+    if 'geo_cache' not in st.session_state:
+        st.session_state.geo_cache = {}  # Search query -> (locations, selectbox labels)
+    if 'map_interactive' not in st.session_state:
+        st.session_state.map_interactive = True  # Render the clickable map until a sidebar selection is made
 
-def update_weather_data(lat, lon):
+def update_weather_data(lat, lon, prefetched=None):
     """
     Fetch and update weather data for the selected location.
 
     Args:
         lat (float): Latitude of the location.
         lon (float): Longitude of the location.
+        prefetched (tuple, optional): Already fetched (current weather, forecast) to use instead of fetching.
     """
+    # Skip the fetch if this spot (to ~1 km) was loaded in the last 5 minutes
+    fetch_coords = (round(lat, 2), round(lon, 2))
+    if (st.session_state.get('last_fetch_coords') == fetch_coords
+            and time.monotonic() - st.session_state.get('last_fetch_ts', 0) < 300):
+        return
+
+    api = get_weather_api(OPENWEATHER_API_KEY)  # Shared client for this server
     try:
         with st.spinner('Fetching weather data...'):  # Display a spinner while loading
-            current_weather = st.session_state.weather_api.get_weather_by_coordinates(lat, lon)
-            forecast_data = st.session_state.weather_api.get_forecast_by_coordinates(lat, lon)
+            if prefetched and prefetched[0] and prefetched[1] is not None:
+                current_weather, forecast_data = prefetched
+            else:
+                # Nothing prefetched (or the prefetch failed), so fetch live
+                current_weather, forecast_data = api.get_weather_and_forecast(lat, lon)
             
             if current_weather and forecast_data is not None:
                 # Calculate key performance indicators (KPIs) for weather
-                kpis = st.session_state.weather_api.calculate_weather_kpis(current_weather, forecast_data)
+                kpis = api.calculate_weather_kpis(current_weather, forecast_data)
                 
                 # Store fetched data in session state
                 st.session_state.current_weather = current_weather
                 st.session_state.forecast_data = forecast_data
+                # Table view built once per fetch: displayed columns only, capped rows, fresh index
+                st.session_state.forecast_view = forecast_data[
+                    ['timestamp', 'temperature', 'humidity', 'wind_speed', 'description']
+                ].head(48).reset_index(drop=True)
+                conditions = forecast_data['description'].value_counts()  # Counts for the pie chart
+                # Charts built once per fetch and kept in the session, like the table view
+                st.session_state.temp_fig = build_temperature_figure(forecast_data)
+                st.session_state.conditions_fig = build_conditions_figure(conditions)
                 st.session_state.kpis = kpis
-                st.session_state.location_name = current_weather.get('city', 'Unknown Location')
+                st.session_state.location_name = current_weather.city
+
+                forecast_stale = forecast_data.attrs.get("stale", False)
+                if current_weather.stale or forecast_stale:
+                    # The API was unreachable; report the age of the stale data, the older one if both are,
+                    # and don't short-circuit the next attempt
+                    stale_times = [current_weather.timestamp] if current_weather.stale else []
+                    if forecast_stale:
+                        stale_times.append(forecast_data.attrs["fetched_at"])
+                    st.warning(
+                        f"Couldn't reach OpenWeatherMap; showing cached data fetched at {min(stale_times)}."
+                    )
+                else:
+                    st.session_state.last_fetch_coords = fetch_coords
+                    st.session_state.last_fetch_ts = time.monotonic()
     except Exception as e:
         # Handle errors and notify the user
         st.error(f"Error updating weather data: {str(e)}")
 
-def create_map():
+def create_base_map(center, zoom):
     """
-    Create and display an interactive map with folium.
+    Build the folium base map (tiles and click popup).
+
+    A new map is built on every run: st_folium renders and attaches layers to the map it is
+    given, so a map shared between runs or sessions would be mutated concurrently.
+
+    Args:
+        center (tuple): Latitude and longitude to center the map on.
+        zoom (int): Initial zoom level.
+
+    Returns:
+        folium.Map: Base map for this run; the marker layer is passed to st_folium separately.
     """
-    # Create a folium map centered at the current map center
+    # Create a folium map centered at the given center
     m = folium.Map(
-        location=st.session_state.map_center,
-        zoom_start=DEFAULT_MAP_ZOOM,  # Default zoom level
+        location=list(center),
+        zoom_start=zoom,  # Default zoom level
         tiles="OpenStreetMap"  # Map style
     )
     
-    # Add a marker for the selected location
-    if st.session_state.selected_location != DEFAULT_MAP_CENTER:
-        folium.Marker(
-            st.session_state.selected_location,
-            icon=folium.Icon(color='red', icon='info-sign')  # Marker styling
-        ).add_to(m)
-    
     # Enable click events to get coordinates
     m.add_child(folium.LatLngPopup())
+    return m
+
+def create_map():
+    """
+    Create and display an interactive map with folium.
+    """
+    # Build this run's base map for the current map center
+    m = create_base_map(tuple(st.session_state.map_center), DEFAULT_MAP_ZOOM)
     
-    # Display the map and capture click events
-    map_data = st_folium(m, width=800, height=400)
+    # Add a marker for the selected location in its own layer, so st_folium can update it in place
+    marker_layer = folium.FeatureGroup(name="Selected location")
+    if st.session_state.selected_location != DEFAULT_MAP_CENTER:
+        folium.CircleMarker(
+            location=st.session_state.selected_location,
+            radius=8,  # Marker size in pixels
+            color='red',  # Marker styling
+            fill=True,
+            fill_opacity=0.8
+        ).add_to(marker_layer)
     
-    # Update the selected location based on the last clicked point
-    if map_data['last_clicked']:
-        clicked_lat = map_data['last_clicked']['lat']
-        clicked_lng = map_data['last_clicked']['lng']
+    if st.session_state.map_interactive:
+        # Display the map and capture click events
+        map_data = st_folium(m, feature_group_to_add=marker_layer, width=800, height=400)
+    else:
+        # Static render skips the component's event round trip; the marker goes straight onto this run's map
+        marker_layer.add_to(m)
+        folium_static(m, width=800, height=400)
+        map_data = {'last_clicked': None}
+        
+        if st.button("Pick from map"):
+            st.session_state.map_interactive = True
+            rerun()
+    
+    # Update the selected location based on the last clicked point; st_folium keeps
+    # returning the last click on later reruns, so only a new click is handled
+    last_clicked = map_data['last_clicked']
+    if last_clicked and last_clicked != st.session_state.get('last_map_click'):
+        st.session_state.last_map_click = last_clicked
+        clicked_lat = last_clicked['lat']
+        clicked_lng = last_clicked['lng']
         st.session_state.selected_location = [clicked_lat, clicked_lng]
         update_weather_data(clicked_lat, clicked_lng)
+        if FRAGMENTS_SUPPORTED:
+            rerun()  # Refresh the dashboard outside the map fragment
+
+@fragment
+def map_fragment():
+    """
+    Display the map; with fragment support, panning and clicking rerun only this part of the page.
+    """
+    create_map()
+
+def build_temperature_figure(forecast_data):
+    """
+    Build the temperature forecast line chart.
+
+    Args:
+        forecast_data (pd.DataFrame): DataFrame with forecast data.
+
+    Returns:
+        go.Figure: Line chart of temperature over time.
+    """
+    fig = go.Figure(go.Scatter(
+        x=forecast_data['timestamp'],
+        y=forecast_data['temperature'],
+        mode='lines'
+    ))
+    fig.update_layout(
+        title='Temperature Over Time',
+        xaxis_title='timestamp',
+        yaxis_title='temperature'
+    )
+    return fig
+
+def build_conditions_figure(conditions):
+    """
+    Build the weather conditions pie chart.
+
+    Args:
+        conditions (pd.Series): Number of forecast entries per weather description.
+
+    Returns:
+        go.Figure: Pie chart of the weather conditions distribution.
+    """
+    fig = go.Figure(go.Pie(
+        labels=conditions.index.astype(str),
+        values=conditions.values
+    ))
+    fig.update_layout(title='Weather Conditions Distribution')
+    return fig
 
 def main():
     """
     Main function to drive the Streamlit app logic.
     """
+    # Shared weather client, created once per server process
+    api = get_weather_api(OPENWEATHER_API_KEY)
+
     # Initialize session state variables
     initialize_session_state()
+
+    # Weather for the quick-select cities, fetched in parallel and shared by all sessions;
+    # it is only an optimization, so on failure the quick select fetches live instead
+    try:
+        prefetched = prefetch_default_locations(api)
+    except Exception:
+        prefetched = {}
     
     # Sidebar for user interactions
     with st.sidebar:
@@ -137,11 +304,18 @@ def main():
         st.subheader("🔍 Search Location")
         search_query = st.text_input("Enter city name", key="search_box")
         
-        if search_query:
-            # Perform geocoding and display results
-            locations = geocode_location(search_query, OPENWEATHER_API_KEY)
-            if locations:
+        if search_query and len(search_query) < 3:
+            st.caption("Type at least 3 characters to search.")
+        elif search_query:
+            # Geocode only queries this session hasn't resolved yet; otherwise reuse results and labels
+            if search_query in st.session_state.geo_cache:
+                locations, location_options = st.session_state.geo_cache[search_query]
+            else:
+                locations = geocode_location(search_query, OPENWEATHER_API_KEY)
                 location_options = [f"{loc[0]}, {loc[3]}" for loc in locations]
+                if locations:
+                    st.session_state.geo_cache[search_query] = (locations, location_options)
+            if locations:
                 selected_index = st.selectbox(
                     "Select location:",
                     range(len(location_options)),
@@ -152,6 +326,7 @@ def main():
                     selected_loc = locations[selected_index]
                     st.session_state.selected_location = [selected_loc[1], selected_loc[2]]
                     st.session_state.map_center = [selected_loc[1], selected_loc[2]]
+                    st.session_state.map_interactive = False
                     update_weather_data(selected_loc[1], selected_loc[2])
         
         st.markdown("---")
@@ -168,7 +343,8 @@ def main():
             location = DEFAULT_LOCATIONS[selected_default]
             st.session_state.selected_location = [location['lat'], location['lon']]
             st.session_state.map_center = [location['lat'], location['lon']]
-            update_weather_data(location['lat'], location['lon'])
+            st.session_state.map_interactive = False
+            update_weather_data(location['lat'], location['lon'], prefetched.get(selected_default))
         
         st.markdown("---")
         st.markdown("### 📍 Selected Location")
@@ -178,7 +354,7 @@ def main():
         
         st.markdown("---")
         st.markdown("### 🗺️ Map Instructions")
-        st.markdown("1. Click anywhere on the map to select location.")
+        st.markdown("1. Click anywhere on the map to select location (use \"Pick from map\" if it is not clickable).")
         st.markdown("2. Use the search box to find specific places.")
         st.markdown("3. Or use quick select for major cities.")
 
@@ -188,7 +364,7 @@ def main():
 
     # Display the interactive map
     st.subheader("🗺️ Interactive Map")
-    create_map()
+    map_fragment()
 
     # Display weather data if available
     if 'current_weather' in st.session_state:
@@ -199,21 +375,21 @@ def main():
         with col1:
             st.metric(
                 "Temperature",
-                f"{st.session_state.current_weather['temperature']}°C",
+                f"{st.session_state.current_weather.temperature}°C",
                 f"{st.session_state.kpis['temp_trend']}°C"
             )
         
         with col2:
             st.metric(
                 "Humidity",
-                f"{st.session_state.current_weather['humidity']}%",
+                f"{st.session_state.current_weather.humidity}%",
                 None
             )
         
         with col3:
             st.metric(
                 "Wind Speed",
-                f"{st.session_state.current_weather['wind_speed']} km/h",
+                f"{st.session_state.current_weather.wind_speed} km/h",
                 None
             )
 
@@ -222,28 +398,16 @@ def main():
         
         with col_temp:
             st.markdown("### 🌡️ Temperature Forecast")
-            fig_temp = px.line(
-                st.session_state.forecast_data,
-                x='timestamp',
-                y='temperature',
-                title='Temperature Over Time'
-            )
-            st.plotly_chart(fig_temp, use_container_width=True)
+            st.plotly_chart(st.session_state.temp_fig, use_container_width=True)
         
         with col_cond:
             st.markdown("### ⛅ Weather Conditions")
-            conditions = st.session_state.forecast_data['description'].value_counts()
-            fig_cond = px.pie(
-                values=conditions.values,
-                names=conditions.index,
-                title='Weather Conditions Distribution'
-            )
-            st.plotly_chart(fig_cond, use_container_width=True)
+            st.plotly_chart(st.session_state.conditions_fig, use_container_width=True)
 
         # Display detailed weather data in a table
         st.markdown("### 📋 Detailed Weather Data")
         st.dataframe(
-            st.session_state.forecast_data,
+            st.session_state.forecast_view,
             use_container_width=True,
             hide_index=True
         )